@@ -93,12 +93,13 @@ def extract_files_from_response(content: str) -> list[dict]:
 def detect_project_type(files: list[dict]) -> str:
     """Detect project type from file list."""
     paths = {f["path"] for f in files}
-    contents = " ".join(f.get("content", "") for f in files)
+    # Lowercase the combined sources once; they can be hundreds of KB
+    contents = " ".join(f.get("content", "") for f in files).lower()
 
-    if any("package.json" in p for p in paths) or "next" in contents.lower():
-        if "next" in contents.lower():
+    if any("package.json" in p for p in paths) or "next" in contents:
+        if "next" in contents:
             return "nextjs"
-        if "vite" in contents.lower():
+        if "vite" in contents:
             return "vite"
         return "node"
     if any("requirements.txt" in p or "pyproject.toml" in p for p in paths):
@@ -127,7 +128,10 @@ def write_files_to_disk(project_dir: Path, files: list[dict]) -> list[str]:
         target.parent.mkdir(parents=True, exist_ok=True)
         target.write_text(content, encoding="utf-8")
         written.append(filepath)
-        console.print(f"[green]  📄 {filepath}[/green]")
+
+    # One render for the whole listing instead of one per file
+    if written:
+        console.print("[green]" + "\n".join(f"  📄 {p}" for p in written) + "[/green]")
 
     return written
 
@@ -144,10 +148,11 @@ async def run_command(cmd: list[str], cwd: Path, timeout: int = 120) -> dict:
         stdout, stderr = await asyncio.wait_for(
             process.communicate(), timeout=timeout
         )
+        # Trim before decoding — install logs can be megabytes and we only keep the tail
         return {
             "success": process.returncode == 0,
-            "stdout": stdout.decode("utf-8", errors="replace")[-2000:],  # Last 2000 chars
-            "stderr": stderr.decode("utf-8", errors="replace")[-2000:],
+            "stdout": stdout[-2000:].decode("utf-8", errors="replace"),  # Last 2000 bytes
+            "stderr": stderr[-2000:].decode("utf-8", errors="replace"),
             "returncode": process.returncode,
         }
     except asyncio.TimeoutError:
@@ -183,6 +188,31 @@ async def install_dependencies(project_dir: Path, project_type: str) -> dict:
     return {"success": True, "stdout": "No dependencies to install", "stderr": ""}
 
 
+async def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 15) -> bool:
+    """
+    Wait until something accepts connections on localhost:port.
+    Returns False as soon as the process exits, or when the timeout runs out.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.05
+
+    while loop.time() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection("localhost", port), timeout=0.2
+            )
+            writer.close()
+            return True
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    return False
+
+
 async def start_dev_server(project_dir: Path, project_type: str) -> dict:
     """Start a dev server and return the localhost URL."""
     cmd = None
@@ -235,11 +265,11 @@ async def start_dev_server(project_dir: Path, project_type: str) -> dict:
                 cwd=str(project_dir),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                preexec_fn=os.setsid,
+                start_new_session=True,  # setsid without preexec_fn keeps the vfork fast path
             )
 
-        # Wait a bit to see if it crashes immediately
-        await asyncio.sleep(3)
+        # Return as soon as the server accepts connections (or crashes)
+        await wait_for_port(port, process)
         if process.poll() is not None:
             stdout = process.stdout.read().decode("utf-8", errors="replace")[-500:]
             stderr = process.stderr.read().decode("utf-8", errors="replace")[-500:]
@@ -3,15 +3,17 @@ Utility functions used across the backend.
 """
 import os
 import re
-import uuid
 import platform
 import subprocess
 from pathlib import Path
 
+# The OS doesn't change at runtime — resolve it once
+_SYSTEM = platform.system()
+
 
 def generate_id() -> str:
-    """Generate a short unique ID."""
-    return str(uuid.uuid4())[:8]
+    """Generate a short unique ID (8 hex chars, same shape as a uuid4 prefix)."""
+    return os.urandom(4).hex()
 
 
 def slugify_name(name: str) -> str:
@@ -24,9 +26,9 @@ def slugify_name(name: str) -> str:
 
 def open_folder(path: Path):
     """Open a folder in the OS file explorer."""
-    if platform.system() == "Windows":
+    if _SYSTEM == "Windows":
         os.startfile(path)
-    elif platform.system() == "Darwin":
+    elif _SYSTEM == "Darwin":
         subprocess.Popen(["open", path])
     else:  # Linux
         subprocess.Popen(["xdg-open", path])
@@ -34,6 +36,4 @@ def open_folder(path: Path):
 
 def truncate_text(text: str, length: int = 100) -> str:
     """Truncate text to a maximum length."""
-    if len(text) <= length:
-        return text
-    return text[:length] + "..."
+    return text[:length] + ("..." if len(text) > length else "")
@@ -19,27 +19,58 @@ SkillKit Integration:
 - Installs relevant skills for your task (testing, security, React, TypeScript, etc.)
 - Skills are made available to the AI agent during execution
 """
+import argparse
+import codecs
+import hashlib
+import io
 import json
 import os
+import random
 import re
 import subprocess
 import sys
 import shutil
+import signal
+import tempfile
 import time
-from pathlib import Path
+import traceback
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from types import MappingProxyType
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from dotenv import load_dotenv
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
 from rich.rule import Rule
-from rich.markdown import Markdown
-import questionary
-from questionary import Style, Choice
+
+# orjson is optional: a C parser/serializer when installed, stdlib json otherwise
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def compact_json(obj) -> str:
+    """Serialize for model-bound prompts: no indentation or spaces, UTF-8 kept as-is."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def indented_json_bytes(obj) -> bytes:
+    """Serialize for human-edited config files: 2-space indent, ready for write_bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
 
 # ── Load .env ──
 ENV_PATH = Path(__file__).parent / ".env"
@@ -51,6 +82,26 @@ if WORKSPACE_ENV.exists():
 
 console = Console()
 
+
+@lru_cache(maxsize=None)
+def section_rule(title: str) -> Rule:
+    """Section divider, built once per title; the title is styled Text so no markup is parsed."""
+    return Rule(Text(title, style="bold #7c3aed"), style="#4b5563")
+
+
+def print_section(title: str, blank_before: bool = False):
+    """Print a section rule and its trailing blank line (plus a leading one) in a single write."""
+    if blank_before:
+        console.print(Group(Text(), section_rule(title), Text()))
+    else:
+        console.print(Group(section_rule(title), Text()))
+
+
+@lru_cache(maxsize=None)
+def _which(name: str):
+    """shutil.which, memoized: PATH doesn't change during a run."""
+    return shutil.which(name)
+
 # ── Bash shell detection ──
 def get_bash_executable() -> str:
     """Get bash executable path, preferring Git Bash on Windows."""
@@ -84,7 +135,7 @@ def get_bash_executable() -> str:
                     # Fallback: just return the path as-is
                     return path
         # Try to find bash in PATH
-        bash = shutil.which("bash")
+        bash = _which("bash")
         if bash:
             return bash
         # Fallback: assume bash is available (WSL or Git Bash in PATH)
@@ -94,8 +145,65 @@ def get_bash_executable() -> str:
 
 BASH_EXECUTABLE = get_bash_executable()
 
+# Popen kwargs that detach a child from the terminal's Ctrl+C
+if sys.platform == "win32":
+    NEW_PROCESS_GROUP = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    NEW_PROCESS_GROUP = {"start_new_session": True}
+
+# Fds Python opens are non-inheritable (PEP 446), so POSIX children can skip
+# the close-every-fd pass; Windows keeps the default so no handles leak
+INHERIT_FDS = {} if sys.platform == "win32" else {"close_fds": False}
+
+
+# Signals besides Ctrl+C that should take a detached child down with the CLI
+STOP_SIGNALS = tuple(getattr(signal, name) for name in ("SIGHUP", "SIGTERM") if hasattr(signal, name))
+
+
+def stop_process_group(process: subprocess.Popen, timeout: float = 5):
+    """Interrupt a child started with NEW_PROCESS_GROUP (and its children); kill them if they linger."""
+    if sys.platform == "win32":
+        if process.poll() is not None:
+            return
+        try:
+            process.send_signal(signal.CTRL_BREAK_EVENT)
+            process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        return
+
+    # The group can outlive its leader (node under npm), so it's signalled
+    # even when the leader is already gone; ESRCH means nothing is left
+    try:
+        os.killpg(process.pid, signal.SIGINT)
+    except ProcessLookupError:
+        process.wait()
+        return
+    deadline = time.monotonic() + timeout
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        pass
+    # The leader often exits first; the rest of the group gets what's left of the timeout
+    while time.monotonic() < deadline:
+        try:
+            os.killpg(process.pid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.05)
+    # Whatever ignored SIGINT is killed outright
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
 # ── Styling ──
-S = Style([
+# questionary drags in prompt_toolkit (and rich.markdown drags in markdown-it), so
+# they're imported by the functions that use them instead of at startup
+# (--help never pays for either)
+PROMPT_STYLE_RULES = [
     ("qmark", "fg:#7c3aed bold"),
     ("question", "fg:#e2e8f0 bold"),
     ("answer", "fg:#22d3ee bold"),
@@ -105,8 +213,15 @@ S = Style([
     ("separator", "fg:#4b5563"),
     ("instruction", "fg:#9ca3af"),
     ("text", "fg:#d1d5db"),
-])
-PROMPT_STYLE = S  # Alias for compatibility
+]
+
+
+@lru_cache(maxsize=1)
+def prompt_style():
+    """questionary Style shared by every prompt, built on first use."""
+    from questionary import Style
+    return Style(PROMPT_STYLE_RULES)
+
 
 # ── Models ──
 FAST_MODEL = "gemini-3-flash-preview"
@@ -118,10 +233,42 @@ MAX_CLARIFICATION_ROUNDS = 4
 CLARIFIER_MODEL = FAST_MODEL
 GEMINI_MODEL = EXEC_MODEL
 
+# ── API rate limiting (free-tier quota is ~15 requests/minute) ──
+API_REQUESTS_PER_MINUTE = 15
+API_MAX_RETRIES = 4
+_api_request_times = deque(maxlen=API_REQUESTS_PER_MINUTE)
+
+
+def rate_limited(fn, *args, **kwargs):
+    """Run a Gemini request under the client-side rate limit, backing off on 429s."""
+    for attempt in range(API_MAX_RETRIES + 1):
+        # Sliding one-minute window: wait until the oldest request ages out
+        if len(_api_request_times) == API_REQUESTS_PER_MINUTE:
+            wait = 60 - (time.monotonic() - _api_request_times[0])
+            if wait > 0:
+                time.sleep(wait)
+        _api_request_times.append(time.monotonic())
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if getattr(e, "code", None) != 429 or attempt == API_MAX_RETRIES:
+                raise
+            time.sleep(min(2 ** attempt, 30) + random.uniform(0, 1))
+
 # ── Dev directory ──
 DEV_DIR = Path.home() / "dev"
 DEV_DIR.mkdir(parents=True, exist_ok=True)
 
+# Directories this process has already created, so repeat writes skip the mkdir syscalls
+_CREATED_DIRS: set[Path] = {DEV_DIR}
+
+
+def ensure_dir(path: Path) -> None:
+    """mkdir -p, once per directory per process."""
+    if path not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
 
 def get_api_key() -> str:
     key = os.getenv("GEMINI_API_KEY", "")
@@ -142,37 +289,43 @@ def header():
 
 
 def ask_who_you_are() -> dict:
-    console.print(Rule("[bold #7c3aed]Who are you?[/]", style="#4b5563"))
-    console.print()
+    import questionary
+
+    print_section("Who are you?")
+
+    style = prompt_style()
+    answers = questionary.form(
+        name=questionary.text("Your name:", style=style),
+        role=questionary.select(
+            "Your role:",
+            choices=["Full-stack developer", "Frontend developer", "Backend developer",
+                     "Designer", "Product manager", "Student / Learning"],
+            style=style,
+        ),
+        level=questionary.select(
+            "Technical level:",
+            choices=[
+                questionary.Choice("Expert -- skip the basics", value="expert"),
+                questionary.Choice("Technical -- comfortable with code", value="technical"),
+                questionary.Choice("Semi-technical -- know some coding", value="semi_technical"),
+                questionary.Choice("Non-technical -- explain everything", value="non_technical"),
+            ],
+            style=style,
+        ),
+        stack=questionary.checkbox(
+            "Tech stack (space to select, enter to confirm):",
+            choices=["React", "Next.js", "Vue", "Svelte", "Angular",
+                     "Node.js", "Python", "Go", "Rust", "Java",
+                     "TypeScript", "Tailwind CSS", "PostgreSQL", "MongoDB",
+                     "Docker", "AWS", "Vercel"],
+            style=style,
+        ),
+    ).ask()
 
-    name = questionary.text("Your name:", style=S).ask() or "Builder"
-
-    role = questionary.select(
-        "Your role:",
-        choices=["Full-stack developer", "Frontend developer", "Backend developer",
-                 "Designer", "Product manager", "Student / Learning"],
-        style=S,
-    ).ask() or "Developer"
-
-    level = questionary.select(
-        "Technical level:",
-        choices=[
-            Choice("Expert -- skip the basics", value="expert"),
-            Choice("Technical -- comfortable with code", value="technical"),
-            Choice("Semi-technical -- know some coding", value="semi_technical"),
-            Choice("Non-technical -- explain everything", value="non_technical"),
-        ],
-        style=S,
-    ).ask() or "semi_technical"
-
-    stack = questionary.checkbox(
-        "Tech stack (space to select, enter to confirm):",
-        choices=["React", "Next.js", "Vue", "Svelte", "Angular",
-                 "Node.js", "Python", "Go", "Rust", "Java",
-                 "TypeScript", "Tailwind CSS", "PostgreSQL", "MongoDB",
-                 "Docker", "AWS", "Vercel"],
-        style=S,
-    ).ask() or []
+    name = answers.get("name") or "Builder"
+    role = answers.get("role") or "Developer"
+    level = answers.get("level") or "semi_technical"
+    stack = answers.get("stack") or []
 
     console.print()
     return {"name": name, "role": role, "technical_level": level, "stack": stack}
@@ -184,8 +337,9 @@ def ask_who_you_are() -> dict:
 
 def ask_what_to_build() -> str:
     """Ask the user what they want to build."""
-    console.print(Rule("[bold #7c3aed]What do you want to build?[/]", style="#4b5563"))
-    console.print()
+    import questionary
+
+    print_section("What do you want to build?")
     console.print("[#9ca3af]Describe your project. Be as detailed or vague as you want —[/]")
     console.print("[#9ca3af]we'll ask follow-up questions to fill in the gaps.[/]")
     console.print()
@@ -193,7 +347,7 @@ def ask_what_to_build() -> str:
     message = questionary.text(
         "Describe your project:",
         multiline=True,
-        style=PROMPT_STYLE,
+        style=prompt_style(),
         instruction="(press ESC then Enter to submit)",
     ).ask()
 
@@ -209,12 +363,16 @@ def ask_what_to_build() -> str:
 # Gemini API calls (lightweight, no DB needed)
 # ──────────────────────────────────────────────
 
-def call_gemini(prompt: str, system: str = "", model: str = None, json_mode: bool = False) -> str:
-    """Call Gemini API synchronously."""
+@lru_cache(maxsize=1)
+def _get_genai():
+    """Import google.genai on first use and share one client for the session."""
     from google import genai
+    return genai, genai.Client(api_key=get_api_key())
+
 
-    api_key = get_api_key()
-    client = genai.Client(api_key=api_key)
+def call_gemini(prompt: str, system: str = "", model: str = None, json_mode: bool = False) -> str:
+    """Call Gemini API synchronously."""
+    genai, client = _get_genai()
 
     config_kwargs = {
         "temperature": 0.3,
@@ -226,7 +384,8 @@ def call_gemini(prompt: str, system: str = "", model: str = None, json_mode: boo
 
     config = genai.types.GenerateContentConfig(**config_kwargs)
 
-    response = client.models.generate_content(
+    response = rate_limited(
+        client.models.generate_content,
         model=model or CLARIFIER_MODEL,
         contents=prompt,
         config=config,
@@ -234,6 +393,73 @@ def call_gemini(prompt: str, system: str = "", model: str = None, json_mode: boo
     return response.text.strip()
 
 
+# Optimizer results, keyed on (prompt, system, model). Reruns with the same
+# intent/answers/approach reuse the previous prompt instead of another round-trip.
+PROMPT_CACHE_DIR = Path.home() / ".brainstorm" / "prompt_cache"
+# Least recently used entries past this many are pruned after each write
+PROMPT_CACHE_MAX_ENTRIES = 200
+# Optimizer replies shorter than this are refusals/failures, not prompts
+MIN_OPTIMIZED_PROMPT_LEN = 50
+
+
+def is_usable_prompt(text: str) -> bool:
+    """Whether an optimizer reply is worth using (and caching) as the final prompt."""
+    return bool(text) and len(text) >= MIN_OPTIMIZED_PROMPT_LEN
+
+
+def _prune_prompt_cache():
+    """Drop the least recently used cache entries beyond PROMPT_CACHE_MAX_ENTRIES."""
+    with os.scandir(PROMPT_CACHE_DIR) as it:
+        entries = [(entry.stat().st_mtime_ns, entry.path) for entry in it if entry.name.endswith(".md")]
+    if len(entries) <= PROMPT_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - PROMPT_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=64)
+def cached_call_gemini(prompt: str, system: str = "", model: str = None) -> str:
+    """call_gemini() memoized in memory for the session and on disk across runs."""
+    key = hashlib.blake2b(digest_size=16)
+    for part in (prompt, system, model or CLARIFIER_MODEL):
+        key.update(part.encode("utf-8"))
+        key.update(b"\0")
+    cache_file = PROMPT_CACHE_DIR / f"{key.hexdigest()}.md"
+
+    try:
+        cached = cache_file.read_text(encoding="utf-8")
+    except OSError:
+        cached = None
+    # Entries written before replies were validated may still hold a short one
+    if is_usable_prompt(cached):
+        # A hit counts as a use, so pruning keeps the entries still being reused
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        return cached
+
+    result = call_gemini(prompt, system=system, model=model)
+
+    # Short or refused replies fall back in build_prompt; caching one would pin that fallback
+    if is_usable_prompt(result):
+        # Write to a temp file and rename so a crash never leaves a torn entry
+        try:
+            ensure_dir(PROMPT_CACHE_DIR)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_file.write_text(result, encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+            _prune_prompt_cache()
+        except OSError:
+            pass
+
+    return result
+
+
 # ──────────────────────────────────────────────
 # Step 3: Intent analysis
 # ──────────────────────────────────────────────
@@ -256,7 +482,7 @@ Rules:
 
 def analyze_intent(message: str, user: dict) -> dict:
     """Analyze user intent with Gemini."""
-    prompt = f"USER PROFILE: {json.dumps(user)}\n\nMESSAGE: {message}"
+    prompt = f"USER PROFILE: {compact_json(user)}\n\nMESSAGE: {message}"
 
     with console.status("[#7c3aed]Analyzing your request...", spinner="dots"):
         raw = call_gemini(prompt, system=INTAKE_SYSTEM, json_mode=True)
@@ -316,10 +542,12 @@ Rules:
 
 def ask_clarifications(message: str, intake: dict, user: dict) -> dict:
     """Generate and ask clarifying questions interactively."""
+    import questionary
+
     prompt = (
         f"USER MESSAGE: {message}\n\n"
-        f"INTENT ANALYSIS: {json.dumps(intake)}\n\n"
-        f"USER PROFILE: {json.dumps(user)}"
+        f"INTENT ANALYSIS: {compact_json(intake)}\n\n"
+        f"USER PROFILE: {compact_json(user)}"
     )
 
     with console.status("[#7c3aed]Generating questions...", spinner="dots"):
@@ -334,8 +562,7 @@ def ask_clarifications(message: str, intake: dict, user: dict) -> dict:
     if not questions:
         return {}
 
-    console.print(Rule("[bold #7c3aed]A few questions[/]", style="#4b5563"))
-    console.print()
+    print_section("A few questions")
 
     answers = {}
 
@@ -353,7 +580,7 @@ def ask_clarifications(message: str, intake: dict, user: dict) -> dict:
             answer = questionary.confirm(
                 q_text,
                 default=default.lower() in ("yes", "true", "y"),
-                style=PROMPT_STYLE,
+                style=prompt_style(),
             ).ask()
             answers[q_text] = "Yes" if answer else "No"
 
@@ -367,7 +594,7 @@ def ask_clarifications(message: str, intake: dict, user: dict) -> dict:
                 q_text,
                 choices=choices,
                 default=default if default in choices else None,
-                style=PROMPT_STYLE,
+                style=prompt_style(),
             ).ask()
             answers[q_text] = answer if answer else default
 
@@ -375,7 +602,7 @@ def ask_clarifications(message: str, intake: dict, user: dict) -> dict:
             answer = questionary.text(
                 q_text,
                 default=default,
-                style=PROMPT_STYLE,
+                style=prompt_style(),
             ).ask()
             answers[q_text] = answer if answer else default
 
@@ -412,11 +639,13 @@ Rules:
 
 def propose_approaches(message: str, intake: dict, qa: dict, user: dict) -> dict:
     """Generate approach proposals and let user pick."""
+    import questionary
+
     prompt = (
         f"USER MESSAGE: {message}\n\n"
-        f"INTENT: {json.dumps(intake)}\n\n"
+        f"INTENT: {compact_json(intake)}\n\n"
         f"Q&A:\n" + "\n".join(f"Q: {q}\nA: {a}" for q, a in qa.items()) + "\n\n"
-        f"USER PROFILE: {json.dumps(user)}"
+        f"USER PROFILE: {compact_json(user)}"
     )
 
     with console.status("[#7c3aed]Brainstorming approaches...", spinner="dots"):
@@ -431,29 +660,38 @@ def propose_approaches(message: str, intake: dict, qa: dict, user: dict) -> dict
     if not approaches:
         return None
 
-    console.print(Rule("[bold #7c3aed]Pick an approach[/]", style="#4b5563"))
-    console.print()
+    print_section("Pick an approach")
 
     if data.get("context_summary"):
         console.print(f"  [#9ca3af]{data['context_summary']}[/]")
         console.print()
 
     # Display approaches
+    effort_colors = {"low": "#22c55e", "medium": "#eab308", "high": "#ef4444"}
     for approach in approaches:
-        rec = " [#22d3ee](recommended)[/]" if approach.get("recommended") else ""
-        effort_colors = {"low": "#22c55e", "medium": "#eab308", "high": "#ef4444"}
         effort = approach.get("effort_level", "medium")
-        effort_styled = f"[{effort_colors.get(effort, '#9ca3af')}]{effort}[/]"
-
-        console.print(Panel(
-            f"[#e2e8f0]{approach.get('description', '')}[/]\n\n"
-            f"[#22c55e]+ {('[/]\n[#22c55e]+ ').join(approach.get('pros', []))}[/]\n"
-            f"[#ef4444]- {('[/]\n[#ef4444]- ').join(approach.get('cons', []))}[/]\n\n"
-            f"Effort: {effort_styled}",
-            title=f"[bold #7c3aed]{approach.get('id', '').upper()}[/] [bold #e2e8f0]{approach.get('title', '')}[/]{rec}",
-            border_style="#4b5563",
-            padding=(0, 2),
-        ))
+
+        # Model output goes in as plain Text: no markup pass, and a stray
+        # "[...]" in a description can't be mistaken for a style tag
+        body = Text()
+        body.append(approach.get("description", ""), style="#e2e8f0")
+        body.append("\n\n")
+        body.append("+ " + "\n+ ".join(approach.get("pros", [])), style="#22c55e")
+        body.append("\n")
+        body.append("- " + "\n- ".join(approach.get("cons", [])), style="#ef4444")
+        body.append("\n\nEffort: ")
+        body.append(effort, style=effort_colors.get(effort, "#9ca3af"))
+
+        title = Text.assemble(
+            (approach.get("id", "").upper(), "bold #7c3aed"),
+            " ",
+            (approach.get("title", ""), "bold #e2e8f0"),
+        )
+        if approach.get("recommended"):
+            title.append(" ")
+            title.append("(recommended)", style="#22d3ee")
+
+        console.print(Panel(body, title=title, border_style="#4b5563", padding=(0, 2)))
 
     # Let user pick
     choices = []
@@ -470,7 +708,7 @@ def propose_approaches(message: str, intake: dict, qa: dict, user: dict) -> dict
         "Which approach?",
         choices=choices,
         default=default_choice,
-        style=PROMPT_STYLE,
+        style=prompt_style(),
     ).ask()
 
     console.print()
@@ -643,11 +881,16 @@ def select_mcps(task_type: str, intent: str) -> list[dict]:
 # Step 7.5: SkillKit Integration - Discover & Install Agent Skills
 # ──────────────────────────────────────────────
 
+def skillkit_cmd(*args: str) -> list[str]:
+    """argv for `npx skillkit@latest ...`; the resolved npx path also runs the Windows .cmd shim without a shell."""
+    return [_which("npx") or "npx", "skillkit@latest", *args]
+
+
 def check_skillkit() -> bool:
     """Check if SkillKit is available."""
     try:
         result = subprocess.run(
-            [BASH_EXECUTABLE, "-c", "npx skillkit@latest --version"],
+            skillkit_cmd("--version"),
             capture_output=True,
             text=True,
             timeout=10,
@@ -661,7 +904,7 @@ def search_skills(query: str) -> list[dict]:
     """Search for skills using SkillKit."""
     try:
         result = subprocess.run(
-            [BASH_EXECUTABLE, "-c", f'npx skillkit@latest find "{query}" --json'],
+            skillkit_cmd("find", query, "--json"),
             capture_output=True,
             text=True,
             timeout=30,
@@ -706,12 +949,12 @@ def _parse_skillkit_output(output: str) -> list[dict]:
 def install_skill(repo: str, skill_name: str = None) -> bool:
     """Install a skill using SkillKit."""
     try:
-        cmd = f'npx skillkit@latest install {repo}'
+        cmd = skillkit_cmd("install", repo)
         if skill_name:
-            cmd += f' --skills {skill_name}'
+            cmd += ["--skills", skill_name]
         
         result = subprocess.run(
-            [BASH_EXECUTABLE, "-c", cmd],
+            cmd,
             capture_output=True,
             text=True,
             timeout=60,
@@ -726,7 +969,7 @@ def list_installed_skills() -> list[str]:
     """List installed skills."""
     try:
         result = subprocess.run(
-            [BASH_EXECUTABLE, "-c", "npx skillkit@latest list"],
+            skillkit_cmd("list"),
             capture_output=True,
             text=True,
             timeout=10,
@@ -775,12 +1018,13 @@ def recommend_skills(task_type: str, intent: str) -> list[dict]:
 
 def discover_and_install_skills(task_type: str, intent: str, user: dict) -> list[str]:
     """Interactive skill discovery and installation."""
+    import questionary
+
     if not check_skillkit():
         console.print("[yellow]SkillKit not available. Install: npm i -g skillkit[/yellow]")
         return []
     
-    console.print(Rule("[bold #7c3aed]Discover Agent Skills[/]", style="#4b5563"))
-    console.print()
+    print_section("Discover Agent Skills")
     console.print("[#9ca3af]Searching for relevant skills from the marketplace...[/]")
     console.print()
     
@@ -809,7 +1053,7 @@ def discover_and_install_skills(task_type: str, intent: str, user: dict) -> list
     install_choice = questionary.confirm(
         "Install recommended skills?",
         default=False,
-        style=PROMPT_STYLE,
+        style=prompt_style(),
     ).ask()
     
     installed = []
@@ -843,115 +1087,216 @@ def discover_and_install_skills(task_type: str, intent: str, user: dict) -> list
 # Step 7.6: Gemini-Kit Integration - AI Agents & Workflows
 # ──────────────────────────────────────────────
 
+Agent = namedtuple("Agent", "name emoji role when")
+
 GEMINI_KIT_AGENTS = {
     # Core Development
-    "planner": {"name": "Planner", "emoji": "📋", "role": "Create detailed plans", "when": "Starting new features"},
-    "scout": {"name": "Scout", "emoji": "🔍", "role": "Explore codebase", "when": "New projects, onboarding"},
-    "coder": {"name": "Coder", "emoji": "💻", "role": "Write clean code", "when": "Implementing features"},
-    "tester": {"name": "Tester", "emoji": "🧪", "role": "Write & run tests", "when": "Quality assurance"},
-    "reviewer": {"name": "Reviewer", "emoji": "👀", "role": "Code review", "when": "Before merging PRs"},
+    "planner": Agent("Planner", "📋", "Create detailed plans", "Starting new features"),
+    "scout": Agent("Scout", "🔍", "Explore codebase", "New projects, onboarding"),
+    "coder": Agent("Coder", "💻", "Write clean code", "Implementing features"),
+    "tester": Agent("Tester", "🧪", "Write & run tests", "Quality assurance"),
+    "reviewer": Agent("Reviewer", "👀", "Code review", "Before merging PRs"),
     
     # Specialists
-    "security-auditor": {"name": "Security Auditor", "emoji": "🔐", "role": "Security audit, OWASP", "when": "Security reviews"},
-    "frontend-specialist": {"name": "Frontend Specialist", "emoji": "⚛️", "role": "React, Next.js, UI/UX", "when": "Frontend development"},
-    "backend-specialist": {"name": "Backend Specialist", "emoji": "🖥️", "role": "API, Database, Docker", "when": "Backend development"},
-    "devops-engineer": {"name": "DevOps Engineer", "emoji": "🚀", "role": "CI/CD, K8s, GitHub Actions", "when": "Infrastructure"},
-    "debugger": {"name": "Debugger", "emoji": "🐛", "role": "Root cause analysis", "when": "Runtime errors"},
-    "database-admin": {"name": "Database Admin", "emoji": "🗄️", "role": "Schema, migrations", "when": "Database work"},
-    "fullstack": {"name": "Fullstack", "emoji": "🌐", "role": "End-to-end", "when": "Full features"},
-    "performance-optimizer": {"name": "Performance Optimizer", "emoji": "⚡", "role": "Core Web Vitals", "when": "Performance issues"},
+    "security-auditor": Agent("Security Auditor", "🔐", "Security audit, OWASP", "Security reviews"),
+    "frontend-specialist": Agent("Frontend Specialist", "⚛️", "React, Next.js, UI/UX", "Frontend development"),
+    "backend-specialist": Agent("Backend Specialist", "🖥️", "API, Database, Docker", "Backend development"),
+    "devops-engineer": Agent("DevOps Engineer", "🚀", "CI/CD, K8s, GitHub Actions", "Infrastructure"),
+    "debugger": Agent("Debugger", "🐛", "Root cause analysis", "Runtime errors"),
+    "database-admin": Agent("Database Admin", "🗄️", "Schema, migrations", "Database work"),
+    "fullstack": Agent("Fullstack", "🌐", "End-to-end", "Full features"),
+    "performance-optimizer": Agent("Performance Optimizer", "⚡", "Core Web Vitals", "Performance issues"),
 }
 
+# Display groups for the agent picker, resolved once
+CORE_AGENTS = tuple(GEMINI_KIT_AGENTS[a] for a in ("planner", "scout", "coder", "tester", "reviewer"))
+SPECIALIST_AGENTS = tuple(GEMINI_KIT_AGENTS[a] for a in (
+    "security-auditor", "frontend-specialist", "backend-specialist",
+    "devops-engineer", "debugger", "database-admin", "fullstack",
+    "performance-optimizer",
+))
+
+# The whole agent listing shown by show_gemini_kit_agents, formatted once
+_AGENT_LISTING = "\n".join([
+    "[bold #22d3ee]Available specialized AI agents:[/]",
+    "",
+    "[bold]Core Development:[/bold]",
+    *(f"  {a.emoji} [bold]{a.name}[/bold] - {a.role}" for a in CORE_AGENTS),
+    "",
+    "[bold]Specialists:[/bold]",
+    *(f"  {a.emoji} [bold]{a.name}[/bold] - {a.role}" for a in SPECIALIST_AGENTS),
+    "",
+])
+_AGENT_CHOICE_LABELS = [
+    ("⚙️ Auto-select based on task", "auto"),
+    *((f"{a.emoji} {a.name} - {a.role}", agent_id) for agent_id, a in GEMINI_KIT_AGENTS.items()),
+    ("❌ Don't use Gemini-Kit agent", "none"),
+]
+
+
+@lru_cache(maxsize=1)
+def _agent_choices() -> tuple:
+    """questionary Choices for the agent picker, built on first use."""
+    import questionary
+    return tuple(questionary.Choice(label, value=value) for label, value in _AGENT_CHOICE_LABELS)
+
+
 GEMINI_KIT_WORKFLOWS = [
     "explore", "plan-compound", "work", "review-compound", "compound",
     "housekeeping", "specs", "triage", "report-bug", "adr", "changelog"
 ]
 
+# Intent keywords -> agent, in priority order (earlier categories win)
+GEMINI_KIT_INTENT_KEYWORDS = [
+    ("security-auditor", ["security", "audit", "vulnerability", "owasp"]),
+    ("frontend-specialist", ["react", "vue", "ui", "frontend", "component", "next.js"]),
+    ("backend-specialist", ["api", "backend", "database", "server", "postgres"]),
+    ("devops-engineer", ["docker", "kubernetes", "ci/cd", "deploy", "devops"]),
+    ("performance-optimizer", ["performance", "optimize", "speed", "slow"]),
+    ("fullstack", ["fullstack", "full stack", "end-to-end"]),
+]
+_INTENT_PRIORITY = {
+    kw: priority
+    for priority, (_, keywords) in enumerate(GEMINI_KIT_INTENT_KEYWORDS)
+    for kw in keywords
+}
+
+# Scan the intent once for every keyword: Aho-Corasick if pyahocorasick is
+# installed, otherwise a single compiled alternation
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+if HAS_AHOCORASICK:
+    _INTENT_AUTOMATON = ahocorasick.Automaton()
+    for _kw, _priority in _INTENT_PRIORITY.items():
+        _INTENT_AUTOMATON.add_word(_kw, _priority)
+    _INTENT_AUTOMATON.make_automaton()
+
+    def _intent_hits(text: str):
+        return (priority for _, priority in _INTENT_AUTOMATON.iter(text))
+else:
+    # One named group per category, in priority order, inside a zero-width
+    # lookahead so overlapping keywords are reported like the automaton does;
+    # m.lastgroup names the category without a per-keyword lookup
+    _INTENT_RE = re.compile(
+        "(?=" + "|".join(
+            f"(?P<c{priority}>" + "|".join(map(re.escape, keywords)) + ")"
+            for priority, (_, keywords) in enumerate(GEMINI_KIT_INTENT_KEYWORDS)
+        ) + ")"
+    )
+    _INTENT_GROUP_PRIORITY = {f"c{priority}": priority for priority in range(len(GEMINI_KIT_INTENT_KEYWORDS))}
+
+    def _intent_hits(text: str):
+        return (_INTENT_GROUP_PRIORITY[m.lastgroup] for m in _INTENT_RE.finditer(text))
+
+# Fallback agent per task type when no intent keyword matches
+TASK_DEFAULT_AGENTS = {
+    "code": "coder",
+    "system_design": "planner",
+    "debugging": "debugger",
+    "creative": "frontend-specialist",
+    "research": "scout",
+    "analysis": "scout",
+}
+
+
+# Agent for each intent category, indexed by priority
+_INTENT_AGENTS = tuple(GEMINI_KIT_AGENTS[agent_id] for agent_id, _ in GEMINI_KIT_INTENT_KEYWORDS)
+
+
+def _match_intent_agent(intent_lower: str) -> Agent | None:
+    """Return the highest-priority agent whose keywords appear in the intent, or None."""
+    best = None
+    for priority in _intent_hits(intent_lower):
+        if best is None or priority < best:
+            best = priority
+            if best == 0:
+                break  # nothing outranks the first category; skip the rest of the intent
+    return _INTENT_AGENTS[best] if best is not None else None
+
 
-def check_gemini_kit() -> dict:
-    """Check if Gemini-Kit is installed and get info."""
-    kit_path = Path.home() / ".gemini" / "extensions" / "gemini-kit"
+GEMINI_KIT_PATH = Path.home() / ".gemini" / "extensions" / "gemini-kit"
+
+
+def _mtime_ns(path: Path):
+    """Modification time of path, or None if it doesn't exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def check_gemini_kit() -> MappingProxyType:
+    """
+    Check if Gemini-Kit is installed and get info.
+    Only the kit directories are stat'ed per call; the directory scans are
+    reused until one of them changes (e.g. the kit is built mid-session).
+    """
+    kit_path = GEMINI_KIT_PATH
+    return _scan_gemini_kit(
+        _mtime_ns(kit_path),
+        _mtime_ns(kit_path / "dist"),
+        _mtime_ns(kit_path / ".agent" / "agents"),
+        _mtime_ns(kit_path / ".agent" / "workflows"),
+    )
+
+
+@lru_cache(maxsize=4)
+def _scan_gemini_kit(kit_mtime, dist_mtime, agents_mtime, workflows_mtime) -> MappingProxyType:
+    """check_gemini_kit() body, keyed on directory mtimes. The result is read-only since every caller shares it."""
+    kit_path = GEMINI_KIT_PATH
     
-    if not kit_path.exists():
-        return {"installed": False, "path": None}
+    if kit_mtime is None:
+        return MappingProxyType({"installed": False, "path": None})
     
     # Check if built
-    dist_path = kit_path / "dist"
-    if not dist_path.exists():
-        return {"installed": True, "built": False, "path": str(kit_path)}
+    if dist_mtime is None:
+        return MappingProxyType({"installed": True, "built": False, "path": str(kit_path)})
     
     # Get available agents and workflows
     agents_path = kit_path / ".agent" / "agents"
     workflows_path = kit_path / ".agent" / "workflows"
     
-    available_agents = []
-    if agents_path.exists():
-        available_agents = [f.stem for f in agents_path.glob("*.md")]
+    available_agents = ()
+    if agents_mtime is not None:
+        available_agents = tuple(f.stem for f in agents_path.glob("*.md"))
     
-    available_workflows = []
-    if workflows_path.exists():
-        available_workflows = [f.stem for f in workflows_path.glob("*.md")]
+    available_workflows = ()
+    if workflows_mtime is not None:
+        available_workflows = tuple(f.stem for f in workflows_path.glob("*.md"))
     
-    return {
+    return MappingProxyType({
         "installed": True,
         "built": True,
         "path": str(kit_path),
         "agents": available_agents,
         "workflows": available_workflows,
-    }
+    })
 
 
-def select_gemini_kit_agent(task_type: str, intent: str) -> dict:
+def select_gemini_kit_agent(task_type: str, intent: str) -> Agent | None:
     """Select appropriate Gemini-Kit agent based on task."""
     kit_info = check_gemini_kit()
     
     if not kit_info.get("installed") or not kit_info.get("built"):
         return None
     
-    # Task type to agent mapping
-    task_agent_map = {
-        "code": ["coder", "frontend-specialist", "backend-specialist"],
-        "system_design": ["planner", "backend-specialist", "devops-engineer"],
-        "debugging": ["debugger", "security-auditor"],
-        "creative": ["frontend-specialist", "coder"],
-        "research": ["scout", "planner"],
-        "analysis": ["scout", "reviewer"],
-    }
-    
-    # Intent-based agent selection
-    intent_lower = intent.lower()
-    
-    # Security
-    if any(kw in intent_lower for kw in ["security", "audit", "vulnerability", "owasp"]):
-        return GEMINI_KIT_AGENTS.get("security-auditor")
-    
-    # Frontend
-    if any(kw in intent_lower for kw in ["react", "vue", "ui", "frontend", "component", "next.js"]):
-        return GEMINI_KIT_AGENTS.get("frontend-specialist")
-    
-    # Backend
-    if any(kw in intent_lower for kw in ["api", "backend", "database", "server", "postgres"]):
-        return GEMINI_KIT_AGENTS.get("backend-specialist")
-    
-    # DevOps
-    if any(kw in intent_lower for kw in ["docker", "kubernetes", "ci/cd", "deploy", "devops"]):
-        return GEMINI_KIT_AGENTS.get("devops-engineer")
-    
-    # Performance
-    if any(kw in intent_lower for kw in ["performance", "optimize", "speed", "slow"]):
-        return GEMINI_KIT_AGENTS.get("performance-optimizer")
-    
-    # Fullstack
-    if any(kw in intent_lower for kw in ["fullstack", "full stack", "end-to-end"]):
-        return GEMINI_KIT_AGENTS.get("fullstack")
+    # Intent-based agent selection (security > frontend > backend > devops > performance > fullstack)
+    agent = _match_intent_agent(intent.lower())
+    if agent:
+        return agent
     
     # Default based on task type
-    suggested_agents = task_agent_map.get(task_type, ["coder"])
-    return GEMINI_KIT_AGENTS.get(suggested_agents[0]) if suggested_agents else None
+    return GEMINI_KIT_AGENTS.get(TASK_DEFAULT_AGENTS.get(task_type, "coder"))
 
 
 def show_gemini_kit_agents() -> str:
     """Interactive agent selection."""
+    import questionary
+
     kit_info = check_gemini_kit()
     
     if not kit_info.get("installed"):
@@ -963,46 +1308,16 @@ def show_gemini_kit_agents() -> str:
         console.print("[yellow]Gemini-Kit not built. Run: cd ~/.gemini/extensions/gemini-kit && npm install && npm run build[/yellow]")
         return None
     
-    console.print(Rule("[bold #7c3aed]Gemini-Kit Agents[/]", style="#4b5563"))
-    console.print()
-    console.print("[bold #22d3ee]Available specialized AI agents:[/]")
-    console.print()
-    
-    # Group agents
-    core_agents = ["planner", "scout", "coder", "tester", "reviewer"]
-    specialist_agents = ["security-auditor", "frontend-specialist", "backend-specialist", 
-                         "devops-engineer", "debugger", "database-admin", "fullstack", 
-                         "performance-optimizer"]
+    print_section("Gemini-Kit Agents")
     
-    # Show core agents
-    console.print("[bold]Core Development:[/bold]")
-    for agent_id in core_agents:
-        if agent_id in GEMINI_KIT_AGENTS:
-            agent = GEMINI_KIT_AGENTS[agent_id]
-            console.print(f"  {agent['emoji']} [bold]{agent['name']}[/bold] - {agent['role']}")
-    console.print()
-    
-    # Show specialists
-    console.print("[bold]Specialists:[/bold]")
-    for agent_id in specialist_agents:
-        if agent_id in GEMINI_KIT_AGENTS:
-            agent = GEMINI_KIT_AGENTS[agent_id]
-            console.print(f"  {agent['emoji']} [bold]{agent['name']}[/bold] - {agent['role']}")
-    console.print()
+    # Show core agents and specialists
+    console.print(_AGENT_LISTING)
     
     # Ask to select
-    choices = []
-    for agent_id, agent in GEMINI_KIT_AGENTS.items():
-        label = f"{agent['emoji']} {agent['name']} - {agent['role']}"
-        choices.append(questionary.Choice(label, value=agent_id))
-    
-    choices.insert(0, questionary.Choice("⚙️ Auto-select based on task", value="auto"))
-    choices.append(questionary.Choice("❌ Don't use Gemini-Kit agent", value="none"))
-    
     selected = questionary.select(
         "Which agent would you like to use?",
-        choices=choices,
-        style=PROMPT_STYLE,
+        choices=list(_agent_choices()),
+        style=prompt_style(),
     ).ask()
     
     console.print()
@@ -1013,6 +1328,9 @@ def show_gemini_kit_agents() -> str:
 # Step 8: Build the optimized prompt
 # ──────────────────────────────────────────────
 
+# How many installed agent skills are listed in the prompt
+MAX_PROMPT_AGENT_SKILLS = 10
+
 OPTIMIZER_SYSTEM = """You are a prompt engineering optimizer. Transform raw context into a PERFECT, self-contained prompt for an AI coding agent.
 
 Your output must be a COMPLETE prompt ready to send. Include:
@@ -1045,40 +1363,43 @@ def build_prompt(
     skills: list,
     mcps: list,
     agent_skills: list = None,
-    gemini_kit_agent: dict = None,
+    gemini_kit_agent: Agent | None = None,
+    use_cache: bool = True,
 ) -> str:
     """Build the optimized prompt using Gemini."""
+    # Bound once here; _fallback_prompt gets the same slice
+    agent_skills = agent_skills[:MAX_PROMPT_AGENT_SKILLS] if agent_skills else []
     sections = []
 
     # Add Gemini-Kit agent role if selected
     if gemini_kit_agent:
         sections.append(
             f"=== YOUR ROLE (Gemini-Kit Agent) ===\n"
-            f"You are the {gemini_kit_agent['emoji']} {gemini_kit_agent['name']} agent.\n"
-            f"Role: {gemini_kit_agent['role']}\n"
-            f"Best used when: {gemini_kit_agent['when']}\n\n"
+            f"You are the {gemini_kit_agent.emoji} {gemini_kit_agent.name} agent.\n"
+            f"Role: {gemini_kit_agent.role}\n"
+            f"Best used when: {gemini_kit_agent.when}\n\n"
             f"As this specialized agent, bring your expert knowledge and focus to this task."
         )
 
     sections.append(f"=== USER MESSAGE ===\n{message}")
-    sections.append(f"=== INTENT ===\n{json.dumps(intake, indent=2)}")
+    sections.append(f"=== INTENT ===\n{compact_json(intake)}")
 
     if qa:
-        qa_text = "\n".join(f"Q: {q}\nA: {a}" for q, a in qa.items())
+        qa_text = "\n".join([f"Q: {q}\nA: {a}" for q, a in qa.items()])
         sections.append(f"=== CLARIFICATION Q&A ===\n{qa_text}")
 
-    sections.append(f"=== USER PROFILE ===\n{json.dumps(user, indent=2)}")
+    sections.append(f"=== USER PROFILE ===\n{compact_json(user)}")
 
     if skills:
-        skill_text = "\n".join(f"- {s['name']}: {s['implementation_template']}" for s in skills)
+        skill_text = "\n".join([f"- {s['name']}: {s['implementation_template']}" for s in skills])
         sections.append(f"=== SKILLS (weave naturally) ===\n{skill_text}")
 
     if agent_skills:
-        agent_skill_text = "\n".join(f"- {s}" for s in agent_skills[:10])
+        agent_skill_text = "- " + "\n- ".join(agent_skills)
         sections.append(f"=== INSTALLED AGENT SKILLS (you have access to these) ===\n{agent_skill_text}\nNote: These are community-vetted skills. Use them when relevant to the task.")
 
     if mcps:
-        mcp_text = "\n".join(f"- {m['name']}: {m['description']}" for m in mcps)
+        mcp_text = "\n".join([f"- {m['name']}: {m['description']}" for m in mcps])
         sections.append(f"=== AVAILABLE TOOLS ===\n{mcp_text}")
 
     if approach:
@@ -1093,9 +1414,10 @@ def build_prompt(
     meta_prompt = "\n\n".join(sections)
 
     with console.status("[#7c3aed]Crafting the perfect prompt...", spinner="dots"):
-        optimized = call_gemini(meta_prompt, system=OPTIMIZER_SYSTEM, model=CLARIFIER_MODEL)
+        ask = cached_call_gemini if use_cache else call_gemini
+        optimized = ask(meta_prompt, system=OPTIMIZER_SYSTEM, model=CLARIFIER_MODEL)
 
-    if not optimized or len(optimized) < 50:
+    if not is_usable_prompt(optimized):
         # Fallback: manual assembly
         optimized = _fallback_prompt(message, intake, qa, approach, user, skills, agent_skills, gemini_kit_agent)
 
@@ -1104,13 +1426,14 @@ def build_prompt(
 
 def _fallback_prompt(message, intake, qa, approach, user, skills, agent_skills=None, gemini_kit_agent=None):
     """Manual prompt assembly when optimizer fails."""
+    agent_skills = agent_skills[:MAX_PROMPT_AGENT_SKILLS] if agent_skills else []
     parts = []
     
     # Add Gemini-Kit agent role first
     if gemini_kit_agent:
-        parts.append(f"You are the {gemini_kit_agent['emoji']} {gemini_kit_agent['name']} agent from Gemini-Kit.")
-        parts.append(f"Your specialty: {gemini_kit_agent['role']}")
-        parts.append(f"You excel at: {gemini_kit_agent['when']}")
+        parts.append(f"You are the {gemini_kit_agent.emoji} {gemini_kit_agent.name} agent from Gemini-Kit.")
+        parts.append(f"Your specialty: {gemini_kit_agent.role}")
+        parts.append(f"You excel at: {gemini_kit_agent.when}")
         parts.append("")
     
     task_type = intake.get("task_type", "code")
@@ -1150,7 +1473,7 @@ def _fallback_prompt(message, intake, qa, approach, user, skills, agent_skills=N
     if agent_skills:
         parts.append("\nINSTALLED AGENT SKILLS:")
         parts.append("You have access to these community-vetted skills:")
-        for s in agent_skills[:10]:
+        for s in agent_skills:
             parts.append(f"- {s}")
 
     parts.append(f"\nUSER REQUEST:\n{message}")
@@ -1161,106 +1484,172 @@ def _fallback_prompt(message, intake, qa, approach, user, skills, agent_skills=N
 # Step 9: Execute via Gemini CLI or API
 # ──────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
 def check_gemini_cli() -> bool:
-    """Check if Gemini CLI is installed."""
-    return shutil.which("gemini") is not None
+    """Check if Gemini CLI is installed (probed once per session)."""
+    return _which("gemini") is not None
 
 
-def initialize_project_dir(project_dir: Path, skills: list, agent_skills: list, mcps: list, gemini_kit_agent: dict = None) -> None:
+def initialize_project_dir(project_dir: Path, skills: list, agent_skills: list, mcps: list, gemini_kit_agent: Agent | None = None) -> None:
     """Initialize project directory with industry-standard AI instruction files."""
     # Create directory structure
-    project_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(project_dir)
     
     # Create .gemini directory (standard for Gemini CLI)
     gemini_dir = project_dir / ".gemini"
-    gemini_dir.mkdir(exist_ok=True)
+    ensure_dir(gemini_dir)
     
-    # Build instructions content that Gemini CLI reads automatically
-    instructions_parts = []
+    # Build instructions content that Gemini CLI reads automatically, and the
+    # .cursorrules copy alongside it. .cursorrules nests every section one level
+    # under the agent role, so headings are written at their level per file
+    # while body text goes to both untouched.
+    instructions = io.StringIO()
+    cursorrules = io.StringIO()
+
+    def write(text: str) -> None:
+        instructions.write(text)
+        cursorrules.write(text)
+
+    def heading(level: int, title: str, cursorrules_level: int = None) -> None:
+        instructions.write(f"{'#' * level} {title}\n")
+        cursorrules.write(f"{'#' * (cursorrules_level or level + 1)} {title}\n")
     
     # Add agent role if using Gemini-Kit
     if gemini_kit_agent:
-        instructions_parts.append(f"""# Agent Role
-
-You are the {gemini_kit_agent.get('emoji')} {gemini_kit_agent.get('name')} agent.
-Role: {gemini_kit_agent.get('role')}
-Best used when: {gemini_kit_agent.get('when')}
-
-As this specialized agent, bring your expert knowledge and focus to this task.
-""")
+        heading(1, "Agent Role", cursorrules_level=1)
+        write(
+            f"\nYou are the {gemini_kit_agent.emoji} {gemini_kit_agent.name} agent.\n"
+            f"Role: {gemini_kit_agent.role}\n"
+            f"Best used when: {gemini_kit_agent.when}\n\n"
+            "As this specialized agent, bring your expert knowledge and focus to this task.\n\n"
+        )
     
     # Add skills
     if skills:
-        instructions_parts.append("# Applied Skills\n")
+        heading(1, "Applied Skills")
+        write("\n")
         for s in skills:
-            instructions_parts.append(f"## {s.get('name')}\n{s.get('implementation_template')}\n")
+            heading(2, s.get("name"))
+            write(f"{s.get('implementation_template')}\n\n")
     
     # Add agent skills
     if agent_skills:
-        instructions_parts.append("# Installed Agent Skills\n")
-        instructions_parts.append("You have access to these community-vetted skills:\n")
+        heading(1, "Installed Agent Skills")
+        write("\nYou have access to these community-vetted skills:\n\n")
         for skill in agent_skills[:20]:
-            instructions_parts.append(f"- {skill}")
-        instructions_parts.append("")
+            write(f"- {skill}\n")
+        write("\n")
     
     # Add MCP tools
     if mcps:
-        instructions_parts.append("# Available Tools (MCP)\n")
+        heading(1, "Available Tools (MCP)")
+        write("\n")
         for mcp in mcps:
-            instructions_parts.append(f"## {mcp.get('name')}\n{mcp.get('description')}\n")
+            heading(2, mcp.get("name"))
+            write(f"{mcp.get('description')}\n\n")
     
-    instructions_content = "\n".join(instructions_parts)
+    instructions_bytes = instructions.getvalue().encode("utf-8")
+    bash_path = BASH_EXECUTABLE if sys.platform == "win32" else "/bin/bash"
     
-    # Write .gemini/instructions.md (read by Gemini CLI automatically)
-    (gemini_dir / "instructions.md").write_text(instructions_content, encoding="utf-8")
-    
-    # Write .gemini/config.json to configure shell execution
+    # .gemini/config.json configures shell execution
     gemini_config = {
-        "shell": get_bash_executable() if sys.platform == "win32" else "/bin/bash",
+        "shell": bash_path,
         "shellArgs": ["-c"],
         "env": {
-            "SHELL": get_bash_executable() if sys.platform == "win32" else "/bin/bash",
+            "SHELL": bash_path,
             "NODE_NO_READLINE": "1",
             "TERM": "dumb"
         }
     }
-    (gemini_dir / "config.json").write_text(json.dumps(gemini_config, indent=2), encoding="utf-8")
     
-    # Write .cursorrules (industry standard for AI tools like Cursor)
-    cursorrules_content = instructions_content.replace("# ", "## ").replace("## Agent Role", "# Agent Role")
-    (project_dir / ".cursorrules").write_text(cursorrules_content, encoding="utf-8")
+    plan = [
+        # Read by Gemini CLI automatically
+        (gemini_dir / "instructions.md", instructions_bytes),
+        (gemini_dir / "config.json", indented_json_bytes(gemini_config)),
+        # Industry standard for AI tools like Cursor
+        (project_dir / ".cursorrules", cursorrules.getvalue().encode("utf-8")),
+        # Common standard at the project root
+        (project_dir / "INSTRUCTIONS.md", instructions_bytes),
+    ]
     
-    # Write INSTRUCTIONS.md at root (common standard)
-    (project_dir / "INSTRUCTIONS.md").write_text(instructions_content, encoding="utf-8")
+    # The files are independent, so issue the writes concurrently
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        for future in [executor.submit(path.write_bytes, data) for path, data in plan]:
+            future.result()
     
-    bash_path = get_bash_executable() if sys.platform == "win32" else "/bin/bash"
-    console.print(f"[#6b7280]✓ Initialized project: {project_dir}[/]")
-    console.print(f"[#6b7280]✓ Created .gemini/instructions.md (Gemini CLI)[/]")
-    console.print(f"[#6b7280]✓ Created .gemini/config.json (shell: {bash_path})[/]")
-    console.print(f"[#6b7280]✓ Created .cursorrules (Cursor/AI tools)[/]")
-    console.print(f"[#6b7280]✓ Created INSTRUCTIONS.md (root)[/]")
-    console.print()
+    console.print("\n".join([
+        f"[#6b7280]✓ Initialized project: {project_dir}[/]",
+        "[#6b7280]✓ Created .gemini/instructions.md (Gemini CLI)[/]",
+        f"[#6b7280]✓ Created .gemini/config.json (shell: {bash_path})[/]",
+        "[#6b7280]✓ Created .cursorrules (Cursor/AI tools)[/]",
+        "[#6b7280]✓ Created INSTRUCTIONS.md (root)[/]",
+        "",
+    ]))
+
+
+# Files brainstorm writes itself; never counted as output from Gemini
+_SKIP_NAMES = frozenset({"GEMINI.md", "brainstorm-output.log", "INSTRUCTIONS.md", ".cursorrules", "error.log"})
+# Config, VCS, dependency and build dirs: never descended into
+_SKIP_DIRS = frozenset({".gemini", ".git", "node_modules", ".next", "dist", ".venv", "__pycache__"})
+# Partial-completion checks only need to know roughly how much was written
+CREATED_FILES_CAP = 50
+
+
+def iter_created_files(directory):
+    """Yield paths of generated files under directory, pruning config/dependency/build dirs."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in _SKIP_DIRS:
+                    yield from iter_created_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name not in _SKIP_NAMES:
+                yield entry.path
+
 
+def find_created_files(directory, cap: int = CREATED_FILES_CAP) -> list[str]:
+    """Up to cap generated files under directory; the walk stops as soon as it has them."""
+    return list(islice(iter_created_files(directory), cap))
 
-def execute_with_gemini_cli(prompt: str, project_dir: Path) -> dict:
+
+def created_files_label(files: list, skip: int = 0) -> str:
+    """Count of files after the first skip, marked as a lower bound when the cap was hit."""
+    count = len(files) - skip
+    return f"{count}+" if len(files) >= CREATED_FILES_CAP else str(count)
+
+
+# Environment overrides for proper shell execution in Gemini CLI
+_GEMINI_ENV_OVERRIDES = MappingProxyType({
+    "SHELL": BASH_EXECUTABLE,  # Tell Gemini CLI to use bash for tool execution
+    "NODE_NO_READLINE": "1",   # Disable Node.js readline
+    "TERM": "dumb",            # Non-interactive terminal
+    "FORCE_COLOR": "0",        # Disable color codes that might break parsing
+    "NO_COLOR": "1",           # Another standard for disabling colors
+})
+
+
+def execute_with_gemini_cli(prompt: str, project_dir: Path, prompt_bytes: bytes = None) -> dict:
     """Execute prompt using Gemini CLI with --yolo flag."""
-    project_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(project_dir)
 
     output_log = project_dir / "brainstorm-output.log"
     prompt_file = project_dir / "GEMINI.md"
 
-    # Write prompt to a file (safer than passing via command line)
-    prompt_file.write_text(prompt, encoding="utf-8")
-    
-    # Verify the file was written correctly
-    if not prompt_file.exists() or prompt_file.stat().st_size == 0:
-        return {"success": False, "error": "Failed to write prompt file"}
+    # Write prompt to a file (safer than passing via command line).
+    # Encode once (unless the caller already did) and write in a single call;
+    # write_bytes raises on failure, so there's nothing to stat afterwards.
+    if prompt_bytes is None:
+        prompt_bytes = prompt.encode("utf-8")
+    prompt_size = len(prompt_bytes)
+    try:
+        prompt_file.write_bytes(prompt_bytes)
+    except OSError as e:
+        return {"success": False, "error": f"Failed to write prompt file: {e}"}
 
     console.print()
     console.print(Panel(
         f"[#e2e8f0]Project directory:[/] [#22d3ee]{project_dir}[/]\n"
         f"[#e2e8f0]Prompt saved to:[/] [#22d3ee]{prompt_file.name}[/]\n"
-        f"[#e2e8f0]Prompt size:[/] [#22d3ee]{len(prompt)} chars ({prompt_file.stat().st_size} bytes)[/]\n"
+        f"[#e2e8f0]Prompt size:[/] [#22d3ee]{len(prompt)} chars ({prompt_size} bytes)[/]\n"
         f"[#e2e8f0]Output log:[/] [#22d3ee]{output_log.name}[/]",
         title="[bold #7c3aed]Gemini CLI[/]",
         border_style="#4b5563",
@@ -1273,72 +1662,65 @@ def execute_with_gemini_cli(prompt: str, project_dir: Path) -> dict:
     console.print(f"[#6b7280]{preview}...[/]")
     console.print()
 
-    # Build the gemini command - use bash consistently to avoid nested shell issues
-    # This way Gemini CLI's tool execution uses the same shell (bash)
-    if sys.platform == "win32":
-        # Use bash on Windows for consistency with tool execution
-        cmd = f'cd "{project_dir}" && cat GEMINI.md | gemini --yolo > brainstorm-output.log 2>&1'
-        shell_cmd = [BASH_EXECUTABLE, "-c", cmd]
-        shell_name = "bash (Git Bash)"
-    else:
-        # Use bash on Unix
-        cmd = f'cat "{prompt_file.name}" | gemini --yolo > "{output_log.name}" 2>&1'
-        shell_cmd = [BASH_EXECUTABLE, "-c", cmd]
-        shell_name = "bash"
+    # Launch gemini directly with the prompt file as stdin and the log as
+    # stdout: no bash/cat processes and no shell quoting. The resolved path
+    # lets CreateProcess run the npm .cmd shim on Windows without a shell.
+    # Gemini CLI's own tool execution still uses bash (SHELL below and
+    # .gemini/config.json).
+    gemini_cmd = [_which("gemini") or "gemini", "--yolo"]
 
     console.print()
-    console.print(f"[#9ca3af]Starting Gemini CLI in {shell_name}...[/]")
-    console.print(f"[#6b7280]Command: cat GEMINI.md | gemini --yolo[/]")
+    console.print("[#9ca3af]Starting Gemini CLI...[/]")
+    console.print("[#6b7280]Command: gemini --yolo < GEMINI.md[/]")
     console.print(f"[#6b7280]Working dir: {project_dir}[/]")
     console.print(f"[#6b7280]Shell for tools: bash (configured in .gemini/config.json)[/]")
     console.print()
 
+    log_fh = None
     try:
         # Configure environment for proper shell execution in Gemini CLI
-        env = os.environ.copy()
-        env.update({
-            "SHELL": BASH_EXECUTABLE,  # Tell Gemini CLI to use bash for tool execution
-            "NODE_NO_READLINE": "1",   # Disable Node.js readline
-            "TERM": "dumb",            # Non-interactive terminal
-            "FORCE_COLOR": "0",        # Disable color codes that might break parsing
-            "NO_COLOR": "1",           # Another standard for disabling colors
-        })
+        env = {**os.environ, **_GEMINI_ENV_OVERRIDES}
         
-        # Use native shell to avoid node-pty console attachment issues on Windows
-        process = subprocess.Popen(
-            shell_cmd,
-            cwd=str(project_dir),
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        # Create the log up front and keep one read handle on it. The child's
+        # stdout truncates the same file, so the handle just follows it —
+        # gemini keeps writing there even if we stop monitoring.
+        output_log.write_bytes(b"")
+        log_fh = open(output_log, "rb")
+        # Raw reads end wherever gemini's last write did, so decode incrementally:
+        # a UTF-8 sequence or \r\n split across two ticks is held until complete
+        log_decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
         )
 
+        # The child inherits both handles, so ours can close right away
+        with open(prompt_file, "rb") as stdin_fh, open(output_log, "wb") as stdout_fh:
+            process = subprocess.Popen(
+                gemini_cmd,
+                cwd=str(project_dir),
+                env=env,
+                stdin=stdin_fh,
+                stdout=stdout_fh,
+                stderr=subprocess.STDOUT,
+            )
+
         # Monitor output with timeout protection
         console.print("[#9ca3af]Gemini CLI is running. Monitoring output...[/]")
         console.print("[#6b7280]Press Ctrl+C to stop monitoring (process continues in background)[/]")
         console.print()
 
-        last_size = 0
+        poll_interval = 0.25
         no_output_count = 0
-        max_no_output_iterations = 150  # 5 minutes (150 * 2 seconds)
+        max_no_output_iterations = int(300 / poll_interval)  # 5 minutes
         
         try:
             while process.poll() is None:
-                time.sleep(2)
+                time.sleep(poll_interval)
                 
-                # Check for output
-                if output_log.exists():
-                    current_size = output_log.stat().st_size
-                    if current_size > last_size:
-                        with open(output_log, "r", encoding="utf-8", errors="replace") as f:
-                            f.seek(last_size)
-                            new_content = f.read()
-                            if new_content.strip():
-                                console.print(new_content, end="")
-                                no_output_count = 0  # Reset counter on new output
-                        last_size = current_size
-                    else:
-                        no_output_count += 1
+                # Check for output (reads from where the last tick stopped)
+                new_content = log_decoder.decode(log_fh.read())
+                if new_content.strip():
+                    console.print(new_content, end="")
+                    no_output_count = 0  # Reset counter on new output
                 else:
                     no_output_count += 1
                 
@@ -1355,15 +1737,11 @@ def execute_with_gemini_cli(prompt: str, project_dir: Path) -> dict:
             console.print(f"[#9ca3af]Check output: {output_log}[/]")
 
         # Final read of output
-        if output_log.exists():
-            with open(output_log, "r", encoding="utf-8", errors="replace") as f:
-                f.seek(last_size)
-                remaining = f.read()
-                if remaining.strip():
-                    console.print(remaining, end="")
+        remaining = log_decoder.decode(log_fh.read(), final=True)
+        if remaining.strip():
+            console.print(remaining, end="")
         
-        console.print()
-        console.print()
+        console.print("\n")
         
         # Check process exit code
         exit_code = process.poll()
@@ -1373,29 +1751,16 @@ def execute_with_gemini_cli(prompt: str, project_dir: Path) -> dict:
             # Check if any files were created (partial success)
             created_files = []
             if project_dir.exists():
-                for item in project_dir.rglob("*"):
-                    if item.is_file() and item.name not in ["GEMINI.md", "brainstorm-output.log", "INSTRUCTIONS.md", ".cursorrules"]:
-                        if not item.name.endswith(".json") or ".gemini" not in str(item):
-                            created_files.append(item)
+                created_files = [Path(p) for p in find_created_files(project_dir)]
             
             if created_files:
-                console.print(f"[#22d3ee]✓ Partial success: {len(created_files)} files created before exit[/]")
+                console.print(f"[#22d3ee]✓ Partial success: {created_files_label(created_files)} files created before exit[/]")
                 for f in created_files[:5]:
                     console.print(f"  [#6b7280]- {f.relative_to(project_dir)}[/]")
                 if len(created_files) > 5:
-                    console.print(f"  [#6b7280]... and {len(created_files) - 5} more[/]")
+                    console.print(f"  [#6b7280]... and {created_files_label(created_files, skip=5)} more[/]")
             else:
                 console.print("[#ef4444]No files were created. Check the logs for errors.[/]")
-            
-            # Read stderr if available
-            try:
-                stderr_output = process.stderr.read().decode("utf-8", errors="replace") if process.stderr else ""
-                if stderr_output.strip():
-                    console.print()
-                    console.print("[#ef4444]Error output:[/]")
-                    console.print(f"[#9ca3af]{stderr_output[:500]}[/]")
-            except Exception:
-                pass
         
         # Verify we got output
         if output_log.exists() and output_log.stat().st_size > 0:
@@ -1462,15 +1827,16 @@ def execute_with_gemini_cli(prompt: str, project_dir: Path) -> dict:
         
         return {"success": False, "error": str(e)}
 
+    finally:
+        if log_fh:
+            log_fh.close()
 
-def execute_with_api(prompt: str, project_dir: Path) -> dict:
-    """Execute prompt using Gemini API directly (fallback when CLI not available)."""
-    from google import genai
 
-    api_key = get_api_key()
-    client = genai.Client(api_key=api_key)
+def execute_with_api(prompt: str, project_dir: Path, prompt_bytes: bytes = None) -> dict:
+    """Execute prompt using Gemini API directly (fallback when CLI not available)."""
+    genai, client = _get_genai()
 
-    project_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(project_dir)
 
     console.print()
     console.print(Panel(
@@ -1482,24 +1848,51 @@ def execute_with_api(prompt: str, project_dir: Path) -> dict:
     ))
     console.print()
 
-    with console.status("[#7c3aed]Generating with Gemini...", spinner="dots"):
-        config = genai.types.GenerateContentConfig(
-            temperature=0.7,
-            max_output_tokens=65536,
-        )
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt,
-            config=config,
-        )
-        content = response.text or ""
+    # Save the prompt, then stream the response straight into the output file
+    (project_dir / "GEMINI.md").write_bytes(prompt_bytes if prompt_bytes is not None else prompt.encode("utf-8"))
+    output_file = project_dir / "brainstorm-output.md"
+    config = genai.types.GenerateContentConfig(
+        temperature=0.7,
+        max_output_tokens=65536,
+    )
 
-    # Save prompt and response
-    (project_dir / "GEMINI.md").write_text(prompt, encoding="utf-8")
-    (project_dir / "brainstorm-output.md").write_text(content, encoding="utf-8")
+    files_written = []
+    seen = set()
+    scanned = 0
+
+    def generate() -> str:
+        nonlocal scanned
+        # Reopened per attempt so a retried request starts from an empty file.
+        # One running buffer: += on a local str extends it in place instead of
+        # re-joining every chunk received so far on each scan
+        content = ""
+        files_written.clear()
+        seen.clear()
+        scanned = 0
+        with open(output_file, "w", encoding="utf-8", buffering=131072) as out:
+            for chunk in client.models.generate_content_stream(
+                model=GEMINI_MODEL,
+                contents=prompt,
+                config=config,
+            ):
+                text = chunk.text
+                if text:
+                    out.write(text)
+                    content += text
+                    # A backtick may have closed a fence: write the blocks completed so far
+                    # while the rest of the response is still streaming in
+                    if "`" in text:
+                        new_files, scanned = extract_file_blocks_from(content, project_dir, seen, scanned)
+                        for path in new_files:
+                            console.print(f"[#6b7280]  + {path}[/]")
+                        files_written.extend(new_files)
+        return content
+
+    with console.status("[#7c3aed]Generating with Gemini...", spinner="dots"):
+        content = rate_limited(generate)
 
-    # Extract and write files
-    files_written = extract_and_write_files(content, project_dir)
+    # Final pass over whatever followed the last complete block
+    files_written.extend(extract_file_blocks_from(content, project_dir, seen, scanned)[0])
 
     return {
         "success": True,
@@ -1509,49 +1902,58 @@ def execute_with_api(prompt: str, project_dir: Path) -> dict:
     }
 
 
-def extract_and_write_files(content: str, project_dir: Path) -> list[str]:
+# File blocks in AI output, compiled once. Both forms share one alternation so
+# finditer walks the content a single time; lastgroup tells them apart:
+#   File: path/to/file.ext  followed by ```      -> path1, body1
+#   ```language:filepath                         -> path2, body2
+_FILE_BLOCK_RE = re.compile(
+    r'(?:^|\n)(?:#+ )?(?:File|file|Filename|filename)[:\s]+(?P<path1>[^\n]+\.\w+)\s*\n'
+    r'```[\w]*\n(?P<body1>.*?)```'
+    r'|```\w*[:\s]+(?P<path2>[^\n`]+\.\w+)\s*\n(?P<body2>.*?)```',
+    re.DOTALL
+)
+
+
+def extract_and_write_files(content: str, project_dir: Path, seen: set = None) -> list[str]:
     """Extract file blocks from AI response and write them to disk."""
+    return extract_file_blocks_from(content, project_dir, set() if seen is None else seen)[0]
+
+
+def extract_file_blocks_from(content: str, project_dir: Path, seen: set, start: int = 0) -> tuple[list[str], int]:
+    """
+    Write the file blocks in content[start:] and return them with the offset to
+    resume from. On a growing response, pass the returned offset and the same
+    seen set back in so earlier text is never rescanned or rewritten.
+    """
     files = []
-    seen = set()
+    resume = start
 
-    # Pattern: File: path/to/file.ext followed by ```
-    pattern = re.compile(
-        r'(?:^|\n)(?:#+ )?(?:File|file|Filename|filename)[:\s]+([^\n]+\.\w+)\s*\n'
-        r'```[\w]*\n(.*?)```',
-        re.DOTALL
-    )
-    for match in pattern.finditer(content):
-        filepath = match.group(1).strip().strip('`"\'')
-        code = match.group(2)
-        if filepath and code and filepath not in seen and not filepath.startswith("http"):
-            normalized = os.path.normpath(filepath)
-            if normalized.startswith("..") or os.path.isabs(normalized):
-                continue
-            target = project_dir / normalized
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(code, encoding="utf-8")
-            files.append(filepath)
-            seen.add(filepath)
-
-    # Pattern 2: ```language:filepath
-    pattern2 = re.compile(
-        r'```\w*[:\s]+([^\n`]+\.\w+)\s*\n(.*?)```',
-        re.DOTALL
-    )
-    for match in pattern2.finditer(content):
-        filepath = match.group(1).strip().strip('`"\'')
-        code = match.group(2)
-        if filepath and code and filepath not in seen and not filepath.startswith("http"):
-            normalized = os.path.normpath(filepath)
-            if normalized.startswith("..") or os.path.isabs(normalized):
-                continue
-            target = project_dir / normalized
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(code, encoding="utf-8")
-            files.append(filepath)
-            seen.add(filepath)
-
-    return files
+    # Both block forms need a code fence — skip the regex scan entirely without one
+    if content.find("```", start) == -1:
+        return files, resume
+
+    for match in _FILE_BLOCK_RE.finditer(content, start):
+        resume = match.end()
+        if match.lastgroup == "body1":
+            filepath, code = match.group("path1", "body1")
+        else:
+            filepath, code = match.group("path2", "body2")
+        filepath = filepath.strip().strip('`"\'')
+        if not filepath or not code or filepath.startswith("http"):
+            continue
+        # Model output uses POSIX-style paths; reject anything that could escape project_dir
+        rel = PurePosixPath(filepath.replace("\\", "/"))
+        normalized = str(rel)
+        if (normalized in seen or not rel.parts or rel.is_absolute()
+                or ".." in rel.parts or ":" in rel.parts[0]):
+            continue
+        target = project_dir / normalized
+        ensure_dir(target.parent)
+        target.write_text(code, encoding="utf-8")
+        files.append(filepath)
+        seen.add(normalized)
+
+    return files, resume
 
 
 # ──────────────────────────────────────────────
@@ -1559,43 +1961,61 @@ def extract_and_write_files(content: str, project_dir: Path) -> list[str]:
 # ──────────────────────────────────────────────
 
 def detect_project_type(project_dir: Path) -> str:
-    """Detect project type from files in directory."""
-    if (project_dir / "package.json").exists():
+    """
+    Detect project type from files in directory.
+    Keyed on the directory and package.json mtimes, so repeat calls skip the
+    scan until a file is added, removed or package.json is edited.
+    """
+    return _detect_project_type(project_dir, _mtime_ns(project_dir), _mtime_ns(project_dir / "package.json"))
+
+
+@lru_cache(maxsize=8)
+def _detect_project_type(project_dir: Path, dir_mtime, package_mtime) -> str:
+    """detect_project_type() body, keyed on mtimes."""
+    # One directory listing instead of a stat (or glob) per marker file
+    try:
+        with os.scandir(project_dir) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        return "unknown"
+
+    if "package.json" in names:
         try:
-            pkg = json.loads((project_dir / "package.json").read_text())
-            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-            if "next" in deps:
+            # Both parsers take raw bytes, which skips a separate decode step
+            raw = (project_dir / "package.json").read_bytes()
+            pkg = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+            deps = pkg.get("dependencies") or {}
+            dev_deps = pkg.get("devDependencies") or {}
+            if "next" in deps or "next" in dev_deps:
                 return "nextjs"
-            if "vite" in deps:
+            if "vite" in deps or "vite" in dev_deps:
                 return "vite"
         except Exception:
             pass
         return "node"
-    if (project_dir / "requirements.txt").exists():
+    if "requirements.txt" in names:
         return "python"
-    if any(project_dir.glob("*.html")):
+    if any(name.endswith(".html") for name in names):
         return "static"
     return "unknown"
 
 
 def post_execution(project_dir: Path, files_written: list[str]):
     """Install dependencies and optionally start dev server."""
+    import questionary
+
     if not files_written:
         console.print("[#9ca3af]No files were created. Nothing to run.[/]")
         return
 
-    console.print()
-    console.print(Rule("[bold #7c3aed]Project created[/]", style="#4b5563"))
-    console.print()
+    print_section("Project created", blank_before=True)
 
     # Show files
-    file_table = Table(show_header=False, border_style="#4b5563", padding=(0, 1))
-    file_table.add_column("File", style="#22d3ee")
-    for f in files_written[:20]:
-        file_table.add_row(f)
+    # One column of names needs no Table layout; Text also keeps paths out of the markup parser
+    file_list = Text("\n".join(files_written[:20]), style="#22d3ee")
     if len(files_written) > 20:
-        file_table.add_row(f"... and {len(files_written) - 20} more")
-    console.print(Panel(file_table, title=f"[bold #7c3aed]{len(files_written)} files[/]", border_style="#4b5563"))
+        file_list.append(f"\n... and {len(files_written) - 20} more", style="#9ca3af")
+    console.print(Panel(file_list, title=f"[bold #7c3aed]{len(files_written)} files[/]", border_style="#4b5563"))
 
     project_type = detect_project_type(project_dir)
 
@@ -1607,50 +2027,74 @@ def post_execution(project_dir: Path, files_written: list[str]):
     install = questionary.confirm(
         f"Install dependencies? (detected: {project_type})",
         default=True,
-        style=PROMPT_STYLE,
+        style=prompt_style(),
     ).ask()
 
+    install_cmd = None
+    installed_msg = "Dependencies installed"
     if install:
+        if project_type in ("nextjs", "vite", "node"):
+            for pm in ["pnpm", "npm"]:
+                pm_path = _which(pm)
+                if pm_path:
+                    install_cmd = [pm_path, "install"]
+                    installed_msg = f"Dependencies installed with {pm}"
+                    break
+        elif project_type == "python":
+            install_cmd = [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+
+    # Start the install now and let it run while the dev-server question is
+    # answered. Progress output is discarded and stderr goes to a temp file, so
+    # a full pipe can't stall it; its own process group keeps a Ctrl+C at the
+    # prompt from killing it. No stdin: the terminal belongs to the prompt.
+    install_proc = None
+    if install_cmd:
+        install_err = tempfile.TemporaryFile()
+        install_proc = subprocess.Popen(
+            install_cmd,
+            cwd=str(project_dir),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=install_err,
+            **NEW_PROCESS_GROUP,
+            **INHERIT_FDS,
+        )
         console.print()
-        with console.status(f"[#7c3aed]Installing dependencies...", spinner="dots"):
-            if project_type in ("nextjs", "vite", "node"):
-                for pm in ["pnpm", "npm"]:
-                    if shutil.which(pm):
-                        result = subprocess.run(
-                            [BASH_EXECUTABLE, "-c", f"{pm} install"],
-                            cwd=str(project_dir),
-                            capture_output=True,
-                            text=True,
-                            timeout=180,
-                        )
-                        if result.returncode == 0:
-                            console.print(f"[#22c55e]Dependencies installed with {pm}[/]")
-                        else:
-                            console.print(f"[#ef4444]Install failed: {result.stderr[:200]}[/]")
-                        break
-            elif project_type == "python":
-                result = subprocess.run(
-                    [BASH_EXECUTABLE, "-c", f"{sys.executable} -m pip install -r requirements.txt"],
-                    cwd=str(project_dir),
-                    capture_output=True,
-                    text=True,
-                    timeout=180,
-                )
-                if result.returncode == 0:
-                    console.print("[#22c55e]Dependencies installed[/]")
-                else:
-                    console.print(f"[#ef4444]Install failed: {result.stderr[:200]}[/]")
+        console.print("[#9ca3af]Installing dependencies in the background...[/]")
 
     # Ask about dev server
+    start_server = False
     if project_type in ("nextjs", "vite", "node", "python", "static"):
         start_server = questionary.confirm(
             "Start dev server?",
             default=True,
-            style=PROMPT_STYLE,
+            style=prompt_style(),
         ).ask()
 
-        if start_server:
-            start_dev(project_dir, project_type)
+    if install_proc:
+        try:
+            with console.status(f"[#7c3aed]Installing dependencies...", spinner="dots"):
+                try:
+                    returncode = install_proc.wait(timeout=180)
+                except subprocess.TimeoutExpired:
+                    # Postinstall scripts/node-gyp live in the same group; stop them all
+                    stop_process_group(install_proc)
+                    returncode = install_proc.returncode
+                except KeyboardInterrupt:
+                    # Its own group never saw the Ctrl+C; don't leave it running after exit
+                    stop_process_group(install_proc)
+                    raise
+            if returncode == 0:
+                console.print(f"[#22c55e]{installed_msg}[/]")
+            else:
+                # Only the tail is shown, so only the tail is read and decoded
+                install_err.seek(max(install_err.seek(0, os.SEEK_END) - 400, 0))
+                console.print(f"[#ef4444]Install failed: {install_err.read().decode('utf-8', errors='replace')}[/]")
+        finally:
+            install_err.close()
+
+    if start_server:
+        start_dev(project_dir, project_type)
 
 
 def start_dev(project_dir: Path, project_type: str):
@@ -1660,18 +2104,23 @@ def start_dev(project_dir: Path, project_type: str):
 
     if project_type in ("nextjs", "vite", "node"):
         for pm in ["pnpm", "npm"]:
-            if shutil.which(pm):
-                cmd = [pm, "run", "dev"]
+            pm_path = _which(pm)
+            if pm_path:
+                # Resolved path so Windows .cmd shims work without a shell
+                cmd = [pm_path, "run", "dev"]
                 port = 3000 if project_type == "nextjs" else 5173
                 break
     elif project_type == "python":
-        if (project_dir / "manage.py").exists():
+        # One directory listing instead of a stat per candidate entry point
+        with os.scandir(project_dir) as entries:
+            names = {entry.name for entry in entries if entry.is_file()}
+        if "manage.py" in names:
             cmd = [sys.executable, "manage.py", "runserver"]
             port = 8000
-        elif (project_dir / "app.py").exists():
+        elif "app.py" in names:
             cmd = [sys.executable, "app.py"]
             port = 8000
-        elif (project_dir / "main.py").exists():
+        elif "main.py" in names:
             cmd = [sys.executable, "main.py"]
             port = 8000
     elif project_type == "static":
@@ -1683,47 +2132,108 @@ def start_dev(project_dir: Path, project_type: str):
         return
 
     console.print()
-    console.print(f"[#22d3ee]Starting dev server on port {port} in bash...[/]")
+    console.print(f"[#22d3ee]Starting dev server on port {port}...[/]")
     console.print(f"[#9ca3af]Press Ctrl+C to stop[/]")
     console.print()
 
+    process = None
+    previous_handlers = {}
+
+    def exit_on_signal(signum, frame):
+        # Unwind out of process.wait() first; the finally below stops the server
+        raise SystemExit(128 + signum)
+
     try:
-        # Convert list command to string for bash execution
-        cmd_str = " ".join(cmd) if isinstance(cmd, list) else cmd
+        # Own process group: Ctrl+C lands on the CLI only, which then stops
+        # the whole server tree (npm -> node, etc.) rather than orphaning it
         process = subprocess.Popen(
-            [BASH_EXECUTABLE, "-c", cmd_str],
+            cmd,
             cwd=str(project_dir),
+            **NEW_PROCESS_GROUP,
+            **INHERIT_FDS,
         )
+        # Same for a closed terminal or a kill: only the CLI hears it, so pass it on
+        for sig in STOP_SIGNALS:
+            previous_handlers[sig] = signal.signal(sig, exit_on_signal)
         console.print(f"[bold #22c55e]Dev server running at http://localhost:{port}[/]")
         console.print()
         process.wait()
     except KeyboardInterrupt:
+        if process is not None:
+            stop_process_group(process)
         console.print()
         console.print("[#eab308]Dev server stopped.[/]")
     except Exception as e:
         console.print(f"[#ef4444]Failed to start dev server: {e}[/]")
+    finally:
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        if process is not None:
+            stop_process_group(process)
 
 
 # ──────────────────────────────────────────────
 # Main flow
 # ──────────────────────────────────────────────
 
+class _SlugTable(dict):
+    """str.translate table keeping word chars, '-' and ' '; entries are filled in on first sight."""
+
+    def __init__(self):
+        super().__init__()
+        # Prefill ASCII so typical intents never fall back to the regex check
+        for codepoint in range(128):
+            self.__missing__(codepoint)
+
+    def __missing__(self, codepoint: int):
+        keep = re.match(r'[\w\- ]', chr(codepoint)) is not None
+        self[codepoint] = codepoint if keep else None
+        return self[codepoint]
+
+
+_SLUG_TABLE = _SlugTable()
+_SLUG_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=32)
 def get_project_dir_from_intent(intent: str) -> Path:
     """Generate a project directory path from the intent."""
-    slug = re.sub(r'[^\w\- ]', '', intent.lower().strip())
-    slug = re.sub(r'\s+', '-', slug)[:50].strip('-')
+    slug = intent.lower().strip().translate(_SLUG_TABLE)
+    slug = _SLUG_WS_RE.sub('-', slug)[:50].strip('-')
     if not slug:
         slug = "brainstorm-project"
     return Path.home() / "dev" / slug
 
 
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parse command-line flags."""
+    parser = argparse.ArgumentParser(
+        description="Interactive coding assistant that builds optimized prompts and hands off to Gemini.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"always regenerate the optimized prompt instead of reusing {PROMPT_CACHE_DIR}",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main CLI entry point."""
+    args = parse_args()
+
+    import questionary
+
     header()
 
     # Verify API key
     get_api_key()
 
+    # Probe for the Gemini CLI in the background while the user answers the intake prompts
+    executor = ThreadPoolExecutor(max_workers=1)
+    cli_probe = executor.submit(check_gemini_cli)
+    executor.shutdown(wait=False)
+
     # Step 1: Who are you?
     user = ask_who_you_are()
 
@@ -1761,7 +2271,7 @@ def main():
     if questionary.confirm(
         "Search for relevant agent skills from marketplace?",
         default=True,
-        style=PROMPT_STYLE,
+        style=prompt_style(),
     ).ask():
         agent_skills = discover_and_install_skills(
             intake.get("task_type", "code"),
@@ -1784,12 +2294,11 @@ def main():
         )
         
         if gemini_kit_agent:
-            console.print(f"[bold #22c55e]→ Auto-selected: {gemini_kit_agent['emoji']} {gemini_kit_agent['name']}[/]")
+            console.print(f"[bold #22c55e]→ Auto-selected: {gemini_kit_agent.emoji} {gemini_kit_agent.name}[/]")
             console.print()
 
     # Display selections
-    console.print(Rule("[bold #7c3aed]Building prompt[/]", style="#4b5563"))
-    console.print()
+    print_section("Building prompt")
 
     info_table = Table(show_header=False, border_style="#4b5563", padding=(0, 1))
     info_table.add_column("", style="#9ca3af", width=12)
@@ -1799,21 +2308,21 @@ def main():
     if agent_skills:
         info_table.add_row("Agent Skills", f"{len(agent_skills)} installed")
     if gemini_kit_agent:
-        info_table.add_row("Kit Agent", f"{gemini_kit_agent['emoji']} {gemini_kit_agent['name']}")
+        info_table.add_row("Kit Agent", f"{gemini_kit_agent.emoji} {gemini_kit_agent.name}")
     if approach:
         info_table.add_row("Approach", approach.get("title", ""))
-    console.print(info_table)
-    console.print()
+    console.print(Group(info_table, Text()))
 
     # Step 8: Build optimized prompt with agent skills and Gemini-Kit agent
-    prompt = build_prompt(message, intake, qa, approach, user, skills, mcps, agent_skills, gemini_kit_agent)
+    prompt = build_prompt(
+        message, intake, qa, approach, user, skills, mcps, agent_skills, gemini_kit_agent,
+        use_cache=not args.no_cache,
+    )
     
     # Show prompt composition summary
-    console.print()
-    console.print("[#9ca3af]Prompt composition:[/]")
     components = []
     if gemini_kit_agent:
-        components.append(f"✓ Gemini-Kit Agent ({gemini_kit_agent['name']})")
+        components.append(f"✓ Gemini-Kit Agent ({gemini_kit_agent.name})")
     components.append(f"✓ User intent & context")
     if qa:
         components.append(f"✓ Clarifications ({len(qa)} Q&A)")
@@ -1825,86 +2334,99 @@ def main():
         components.append(f"✓ Agent Skills ({len(agent_skills)} installed)")
     if mcps:
         components.append(f"✓ MCP Tools ({len(mcps)} available)")
-    
-    for comp in components:
-        console.print(f"  [#6b7280]{comp}[/]")
-    console.print(f"  [bold #22d3ee]Total: {len(prompt)} characters[/]")
-    console.print()
 
-    # Step 9: Choose execution method
-    project_dir = get_project_dir_from_intent(intake.get("interpreted_intent", message))
+    console.print("\n".join([
+        "",
+        "[#9ca3af]Prompt composition:[/]",
+        *(f"  [#6b7280]{comp}[/]" for comp in components),
+        f"  [bold #22d3ee]Total: {len(prompt)} characters[/]",
+        "",
+    ]))
 
-    has_cli = check_gemini_cli()
+    # Every execution path saves the prompt as UTF-8; encode it once here
+    prompt_bytes = prompt.encode("utf-8")
 
+    # Step 9: Choose execution method
+    has_cli = cli_probe.result()
+
+    choices = [
+        questionary.Choice("Gemini API (generate + scaffold files)", value="api"),
+        questionary.Choice("Just show me the prompt (copy/paste)", value="prompt"),
+    ]
     if has_cli:
-        exec_method = questionary.select(
-            "How to execute?",
-            choices=[
-                questionary.Choice("Gemini CLI (--yolo, runs in project dir)", value="cli"),
-                questionary.Choice("Gemini API (generate + scaffold files)", value="api"),
-                questionary.Choice("Just show me the prompt (copy/paste)", value="prompt"),
-            ],
-            style=PROMPT_STYLE,
-        ).ask()
-    else:
-        exec_method = questionary.select(
-            "How to execute?",
-            choices=[
-                questionary.Choice("Gemini API (generate + scaffold files)", value="api"),
-                questionary.Choice("Just show me the prompt (copy/paste)", value="prompt"),
-            ],
-            style=PROMPT_STYLE,
-        ).ask()
+        choices.insert(0, questionary.Choice("Gemini CLI (--yolo, runs in project dir)", value="cli"))
 
-    if not exec_method:
-        exec_method = "prompt"
+    exec_method = questionary.select(
+        "How to execute?",
+        choices=choices,
+        style=prompt_style(),
+    ).ask() or "prompt"
     
-    # Option to preview prompt before execution (for CLI method)
+    # Option to preview prompt before execution (for CLI method).
+    # Short prompts are simply shown in full instead of asking first.
     if exec_method == "cli":
-        if questionary.confirm(
+        show_all = len(prompt) <= 2000
+        if show_all:
+            console.print(Group(
+                Text(),
+                section_rule("Prompt"),
+                Text(),
+                Panel(Text(prompt, style="#e2e8f0"), border_style="#4b5563", padding=(1, 2)),
+                Text(),
+            ))
+        elif questionary.confirm(
             "Preview the full prompt before sending to Gemini?",
             default=False,
-            style=PROMPT_STYLE,
+            style=prompt_style(),
         ).ask():
-            console.print()
-            console.print(Rule("[bold #7c3aed]Prompt Preview[/]", style="#4b5563"))
-            console.print()
-            # Show first 1000 chars
-            preview_len = min(1000, len(prompt))
-            console.print(Panel(
-                f"[#e2e8f0]{prompt[:preview_len]}[/]\n\n[#9ca3af]... (total {len(prompt)} chars)[/]",
-                border_style="#4b5563",
-                padding=(1, 2),
+            # Show first 1000 chars; Text keeps the prompt out of the markup parser
+            preview = Text(prompt[:1000], style="#e2e8f0")
+            preview.append(f"\n\n... (total {len(prompt)} chars)", style="#9ca3af")
+            console.print(Group(
+                Text(),
+                section_rule("Prompt Preview"),
+                Text(),
+                Panel(preview, border_style="#4b5563", padding=(1, 2)),
+                Text(),
             ))
-            console.print()
             
-            if not questionary.confirm("Continue with execution?", default=True, style=PROMPT_STYLE).ask():
+            if not questionary.confirm("Continue with execution?", default=True, style=prompt_style()).ask():
                 console.print("[#eab308]Execution cancelled.[/]")
                 return
 
+    # Every remaining branch writes into the project dir; resolve it only now
+    project_dir = get_project_dir_from_intent(intake.get("interpreted_intent", message))
+
     if exec_method == "prompt":
-        # Initialize project directory with skills
-        initialize_project_dir(project_dir, skills, agent_skills, mcps, gemini_kit_agent)
-        
-        console.print()
-        console.print(Rule("[bold #7c3aed]Your prompt[/]", style="#4b5563"))
-        console.print()
-        console.print(Panel(
-            Markdown(prompt),
-            border_style="#4b5563",
-            padding=(1, 2),
-        ))
+        from rich.markdown import Markdown
 
-        # Also save to file
         prompt_file = project_dir / "GEMINI.md"
-        prompt_file.write_text(prompt, encoding="utf-8")
+
+        # Parse the Markdown in a worker while the project files are written
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rendered = executor.submit(Markdown, prompt)
+
+            # Initialize project directory with skills
+            initialize_project_dir(project_dir, skills, agent_skills, mcps, gemini_kit_agent)
+
+            # Also save to file, in the background while the panel renders
+            saved = executor.submit(prompt_file.write_bytes, prompt_bytes)
+
+            console.print(Group(
+                Text(),
+                section_rule("Your prompt"),
+                Text(),
+                Panel(rendered.result(), border_style="#4b5563", padding=(1, 2)),
+            ))
+            saved.result()
+
         console.print(f"\n[#9ca3af]Prompt saved to: {prompt_file}[/]")
 
     elif exec_method == "cli":
         # Initialize project directory with skills
         initialize_project_dir(project_dir, skills, agent_skills, mcps, gemini_kit_agent)
         
-        result = execute_with_gemini_cli(prompt, project_dir)
+        result = execute_with_gemini_cli(prompt, project_dir, prompt_bytes)
         if result.get("success"):
             console.print()
             
@@ -1916,13 +2438,10 @@ def main():
                 # Check if any files were created
                 created_files = []
                 if Path(result['project_dir']).exists():
-                    for item in Path(result['project_dir']).rglob("*"):
-                        if item.is_file() and item.name not in ["GEMINI.md", "brainstorm-output.log", "INSTRUCTIONS.md", ".cursorrules"]:
-                            if not item.name.endswith(".json") or ".gemini" not in str(item):
-                                created_files.append(item)
+                    created_files = find_created_files(result['project_dir'])
                 
                 if created_files:
-                    console.print(f"[#22d3ee]✓ {len(created_files)} files created[/]")
+                    console.print(f"[#22d3ee]✓ {created_files_label(created_files)} files created[/]")
                     console.print()
                     console.print("[#9ca3af]Would you like to:[/]")
                     console.print("  [#6b7280]1. Continue manually in the project directory[/]")
@@ -1939,13 +2458,13 @@ def main():
             console.print(f"[#ef4444]Execution failed: {result.get('error', 'Unknown')}[/]")
             
             # Offer fallback to API
-            if check_gemini_cli():
+            if has_cli:
                 console.print()
                 console.print("[#eab308]Retry with Gemini API instead? (More stable, no shell execution)[/]")
-                if questionary.confirm("Use API fallback?", default=True, style=PROMPT_STYLE).ask():
+                if questionary.confirm("Use API fallback?", default=True, style=prompt_style()).ask():
                     console.print()
                     console.print("[#22d3ee]Retrying with Gemini API...[/]")
-                    result = execute_with_api(prompt, project_dir)
+                    result = execute_with_api(prompt, project_dir, prompt_bytes)
                     if result.get("success"):
                         files_written = result.get("files_written", [])
                         if files_written:
@@ -1958,7 +2477,7 @@ def main():
         # Initialize project directory with skills
         initialize_project_dir(project_dir, skills, agent_skills, mcps, gemini_kit_agent)
         
-        result = execute_with_api(prompt, project_dir)
+        result = execute_with_api(prompt, project_dir, prompt_bytes)
         if result.get("success"):
             files_written = result.get("files_written", [])
             if files_written:
@@ -1969,10 +2488,10 @@ def main():
                 # Show the response since no files were extracted
                 console.print()
                 console.print("[#eab308]⚠ No code files extracted from response.[/]")
-                console.print(Rule("[bold #7c3aed]Response[/]", style="#4b5563"))
-                console.print()
+                print_section("Response")
                 content = result.get("content", "")
                 if content:
+                    from rich.markdown import Markdown
                     console.print(Markdown(content[:2000]))  # Show first 2000 chars
                     if len(content) > 2000:
                         console.print(f"\n[#9ca3af]... (truncated, full output in brainstorm-output.md)[/]")
@@ -1982,31 +2501,30 @@ def main():
             console.print(f"[#ef4444]API execution failed: {result.get('error', 'Unknown')}[/]")
             console.print("[#9ca3af]Check your GEMINI_API_KEY and network connection.[/]")
 
-    console.print()
-    console.print("[#4b5563]---[/]")
-    console.print("[#9ca3af]brainstorm cli[/]")
-    console.print()
+    console.print(Group(
+        Text(),
+        Text("---", style="#4b5563"),
+        Text("brainstorm cli", style="#9ca3af"),
+        Text(),
+    ))
 
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        console.print()
-        console.print()
+        console.print("\n")
         console.print("[#eab308]⚠ Interrupted by user (Ctrl+C)[/]")
         console.print("[#9ca3af]Any work in progress has been saved to the project directory.[/]")
         sys.exit(0)
     except Exception as e:
-        console.print()
-        console.print()
+        console.print("\n")
         console.print(f"[#ef4444]✗ Unexpected error: {e}[/]")
         console.print(f"[#9ca3af]Error type: {type(e).__name__}[/]")
         
         # Try to save error state
         try:
             error_file = DEV_DIR / "brainstorm-error.log"
-            import traceback
             error_details = f"""Brainstorm CLI Error Report
 Time: {time.strftime('%Y-%m-%d %H:%M:%S')}
 Error: {e}
@@ -3,6 +3,7 @@ Dev script — starts backend + frontend dev servers.
 """
 import os
 import sys
+import socket
 import subprocess
 import webbrowser
 import time
@@ -25,6 +26,21 @@ def get_python():
     return str(venv_path / "bin" / "python")
 
 
+def wait_port(port: int, timeout: float = 10) -> bool:
+    """Wait until something accepts connections on localhost:port."""
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        try:
+            # "localhost" so both 127.0.0.1 and ::1 (newer Node/Vite) are tried
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+    return False
+
+
 def main():
     print("=" * 50)
     print("  Brainstorm AI — Dev Server")
@@ -63,8 +79,9 @@ def main():
         )
         processes.append(frontend_proc)
 
-        # Wait a bit, then open browser
-        time.sleep(2)
+        # Open the browser once the frontend is actually listening
+        if not wait_port(FRONTEND_PORT):
+            print(f"⚠ Frontend not answering on port {FRONTEND_PORT} yet, opening anyway")
         url = f"http://localhost:{FRONTEND_PORT}"
         print(f"\n  🌐 Open: {url}")
         print(f"  📡 API:  http://localhost:{BACKEND_PORT}")